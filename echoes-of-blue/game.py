@@ -1,10 +1,23 @@
 import pygame
+import numpy as np
+import argparse
 import math
 import random
+import gc
+import gzip
+import json
+import os
+import threading
+import time
+import tracemalloc
+import zlib
+from array import array
+from collections import Counter
 from dataclasses import dataclass
 from typing import List, Tuple
 
-# Initialize Pygame
+# Initialize Pygame - a small mixer buffer keeps sound effects low latency
+pygame.mixer.pre_init(44100, -16, 2, 512)
 pygame.init()
 
 # Constants
@@ -33,6 +46,85 @@ TANK_GRAY = (80, 80, 90)
 PLATFORM_WOOD = (120, 80, 50)
 UI_BG = (20, 30, 40)
 
+# Telemetry
+TELEMETRY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "telemetry")
+TELEMETRY_CAPACITY = 8192  # Records held in the ring buffer
+TELEMETRY_BATCH = 256  # Wake the writer once this many records are pending
+TELEMETRY_FLUSH_INTERVAL = 1.0  # Seconds between flushes when idle
+
+# Telemetry event codes - index into TELEMETRY_EVENTS (name, field a, field b)
+EVT_FRAME = 0
+EVT_JUMP = 1
+EVT_TRICK = 2
+EVT_SPLASH = 3
+EVT_CLEAN_ENTRY = 4
+EVT_COMBO_BREAK = 5
+EVT_GC = 6
+TELEMETRY_EVENTS = (
+    ("frame", "frame_ms", "particles"),
+    ("jump", "speed", "vy"),
+    ("trick", "rotations", "points"),
+    ("splash", "clean", "tricks"),
+    ("clean_entry", "bonus", "combo"),
+    ("combo_break", "combo", "score"),
+    ("gc", "generation", "gc_ms"),
+)
+
+# Garbage collection scheduling
+FRAME_MS = 1000 / FPS
+GC_MIN_IDLE_MS = 4.0  # Frame slack needed before collecting
+GC_FULL_IDLE_MS = 10.0  # Frame slack needed before an older-generation pass
+GC_YOUNG_THRESHOLD = 700  # Pending allocations before a young collection is wanted
+GC_FORCE_THRESHOLD = 20000  # Collect regardless of slack past this point
+GC_OLDER_EVERY = 10  # Young collections between generation 1 passes
+GC_FULL_EVERY_FRAMES = FPS * 30  # Minimum frames between full collections
+ALLOC_TRACE_TOP = 10  # Lines reported per tracemalloc snapshot diff
+
+# Post-processing
+POSTFX_LUT_BITS = 6  # Bits per channel in the baked color-grading LUT
+POSTFX_BUDGET_MS = 8.0  # Running cost above this drops the soft blur layer
+POSTFX_SCALE = 2  # Downscale factor the effects run at
+POSTFX_SAMPLE_FRAMES = 30  # Frames measured before the cost is checked
+POSTFX_BLUR_FACTOR = 4  # Downsample factor of the soft blur layer, relative to full resolution
+
+# Audio
+SOUND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sounds")
+MUSIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "music")
+AUDIO_VOICES = 12  # Channels in the sound effect pool
+MUSIC_BED = "tank"  # Main stem, streamed from disk
+MUSIC_OVERLAYS = ("title", "swell")  # Short stems held in memory
+MUSIC_VOLUME = 0.6
+MUSIC_FADE_FRAMES = 45  # Frames for a crossfade between stems
+MUSIC_SWELL_COMBO = 3  # Combo that brings in the swell stem
+MUSIC_SWELL_HOLD = FPS * 4  # Frames the swell lingers after the combo drops
+
+# Sound effects: name -> (priority, minimum ms between plays)
+SOUNDS = {
+    "splash": (3, 80),
+    "trick": (4, 60),
+    "crowd": (2, 500),
+    "bubble": (1, 120),
+}
+
+# Grading and effect settings per mood
+MOODS = {
+    "dream": {
+        "saturation": 0.5, "contrast": 0.9,
+        "tint": (1.3, 1.08, 0.7), "lift": (24, 14, 0),
+        "blur": 0.45, "vignette": 0.55, "chroma": 3,
+    },
+    "memory": {
+        "saturation": 0.35, "contrast": 0.85,
+        "tint": (1.06, 0.98, 0.86), "lift": (20, 14, 6),
+        "blur": 0.3, "vignette": 0.7, "chroma": 2,
+    },
+    "captivity": {
+        "saturation": 0.55, "contrast": 1.05,
+        "tint": (0.95, 1.0, 1.04), "lift": (0, 0, 0),
+        "blur": 0.0, "vignette": 0.3, "chroma": 0,
+    },
+}
+
 @dataclass
 class Particle:
     x: float
@@ -349,8 +441,639 @@ class Dolphin:
         rect = rotated.get_rect(center=(int(self.x), int(self.y)))
         surface.blit(rotated, rect)
 
-class Game:
+class FrameScheduler:
+    """Keeps cyclic garbage collection out of the middle of frames.
+
+    Objects alive at startup are frozen out of the collector and automatic
+    collection is disabled while the game runs. After each clock tick the
+    work time of the last frame decides whether there is enough slack to run
+    a young collection now. Older generations come due on a fixed cadence and
+    prefer a nearly idle frame, but a due pass rides along with any forced
+    collection and runs regardless of slack once it is overdue. A hard ceiling
+    on pending allocations forces collections, so every generation is still
+    visited even if the game never gets any slack.
+
+    With trace_every > 0, every that many frames the allocation sites in this
+    file are reported. The sampled frame is snapshotted at its start and again
+    at its peak (drawn, before flip), so per-frame temporaries are attributed
+    to the lines that made them. Net growth since the previous report is
+    listed as well.
+    """
+
+    def __init__(self, telemetry=None, trace_every=0):
+        self.telemetry = telemetry
+        self.trace_every = trace_every
+        self.frame = 0
+        self.young_since_older = 0
+        self.last_full_frame = 0
+        self.last_snapshot = None
+        self.frame_snapshot = None
+        self.frame_stats = []
+
+    def take_snapshot(self):
+        # Only this file's lines - the loop's own call sites
+        return tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(True, __file__),))
+
+    def start(self):
+        gc.collect()
+        gc.freeze()
+        gc.disable()
+        if self.trace_every:
+            tracemalloc.start()
+            self.last_snapshot = self.take_snapshot()
+
+    def stop(self):
+        if self.trace_every:
+            tracemalloc.stop()
+        gc.unfreeze()
+        gc.enable()
+
+    def idle(self, work_ms):
+        self.frame += 1
+        pending = gc.get_count()[0]
+        slack = FRAME_MS - work_ms
+
+        forced = pending >= GC_FORCE_THRESHOLD
+
+        if forced or (pending >= GC_YOUNG_THRESHOLD and slack >= GC_MIN_IDLE_MS):
+            # Due passes stay due until they run; slack only decides how early
+            frames_since_full = self.frame - self.last_full_frame
+            full_due = frames_since_full >= GC_FULL_EVERY_FRAMES
+            full_overdue = frames_since_full >= 2 * GC_FULL_EVERY_FRAMES
+            older_due = self.young_since_older >= GC_OLDER_EVERY
+            older_overdue = self.young_since_older >= 2 * GC_OLDER_EVERY
+            roomy = forced or slack >= GC_FULL_IDLE_MS
+
+            if full_due and (roomy or full_overdue):
+                generation = 2
+            elif older_due and (roomy or older_overdue):
+                generation = 1
+            else:
+                generation = 0
+
+            start = time.perf_counter()
+            gc.collect(generation)
+            if generation == 2:
+                self.last_full_frame = self.frame
+            if generation >= 1:
+                self.young_since_older = 0
+            else:
+                self.young_since_older += 1
+            if self.telemetry:
+                self.telemetry.log(EVT_GC, generation, (time.perf_counter() - start) * 1000)
+
+        if self.trace_every and self.frame % self.trace_every == 0:
+            self.report_allocations()
+
+    def begin_frame(self):
+        if self.trace_every and (self.frame + 1) % self.trace_every == 0:
+            self.frame_snapshot = self.take_snapshot()
+
+    def frame_peak(self):
+        if self.frame_snapshot:
+            self.frame_stats = self.take_snapshot().compare_to(self.frame_snapshot, 'lineno')
+            self.frame_snapshot = None
+
+    def report_allocations(self):
+        snapshot = self.take_snapshot()
+        growth = snapshot.compare_to(self.last_snapshot, 'lineno')
+        self.last_snapshot = snapshot
+
+        print(f"Top allocating lines within frame {self.frame} (start to peak):")
+        for stat in self.frame_stats[:ALLOC_TRACE_TOP]:
+            print(f"  {stat}")
+        print(f"Net memory growth by line over the last {self.trace_every} frames:")
+        for stat in growth[:ALLOC_TRACE_TOP]:
+            print(f"  {stat}")
+
+_mood_luts = {}
+_packed_luts = {}
+
+def bake_lut(mood):
+    """Return the (levels**3, 3) RGB grading LUT for a mood, baking it on first use."""
+    if mood not in _mood_luts:
+        settings = MOODS[mood]
+        levels = 1 << POSTFX_LUT_BITS
+        step = 256 / levels
+        channel = np.arange(levels) * step + step / 2
+        rgb = np.stack(np.meshgrid(channel, channel, channel, indexing='ij'), axis=-1)
+
+        luma = (rgb @ np.array([0.299, 0.587, 0.114]))[..., None]
+        rgb = luma + (rgb - luma) * settings["saturation"]
+        rgb = (rgb - 128) * settings["contrast"] + 128
+        rgb = rgb * np.array(settings["tint"]) + np.array(settings["lift"])
+        _mood_luts[mood] = np.clip(rgb, 0, 255).astype(np.uint8).reshape(-1, 3)
+    return _mood_luts[mood]
+
+def pack_lut(mood, shifts):
+    """Return (table, shift, mask) grading packed pixels with the given channel shifts.
+
+    The LUT is spread over a sparse table indexed by the masked pixel itself,
+    so a lookup is one shift, one mask and one take over the frame. Tables
+    are cached per mood and pixel layout.
+    """
+    key = (mood, shifts)
+    if key not in _packed_luts:
+        r_shift, g_shift, b_shift = shifts[:3]
+        low = min(r_shift, g_shift, b_shift)
+        bits = POSTFX_LUT_BITS
+        mask = sum(((1 << bits) - 1) << (shift - low) for shift in (r_shift, g_shift, b_shift))
+
+        levels = np.arange(1 << bits, dtype=np.uint32)
+        r, g, b = np.meshgrid(levels, levels, levels, indexing='ij')
+        sparse = ((r << (r_shift - low)) | (g << (g_shift - low)) | (b << (b_shift - low))).ravel()
+
+        lut = bake_lut(mood).astype(np.uint32)
+        table = np.zeros(mask + 1, np.uint32)
+        table[sparse] = (lut[:, 0] << r_shift) | (lut[:, 1] << g_shift) | (lut[:, 2] << b_shift)
+        _packed_luts[key] = (table, low + 8 - bits, mask)
+    return _packed_luts[key]
+
+class ColorGrade:
+    """Maps every pixel through a mood's baked 3D LUT."""
+
+    def __init__(self, mood):
+        self.mood = mood
+        self.indices = {}  # Index buffer per frame shape
+
+    def apply(self, surface):
+        packed, shift, mask = pack_lut(self.mood, surface.get_shifts())
+        shape = (surface.get_height(), surface.get_width())
+        if shape not in self.indices:
+            self.indices[shape] = np.empty(shape, np.uint32)
+        index = self.indices[shape]
+
+        # Transposed view walks the surface in memory order
+        pixels = pygame.surfarray.pixels2d(surface).T
+        np.right_shift(pixels, shift, out=index)
+        np.bitwise_and(index, mask, out=index)
+        np.take(packed, index, out=pixels)
+        del pixels
+
+def average_packed(a, b, out, scratch):
+    """Per-channel floor average of two arrays of packed 8-bit-channel pixels."""
+    np.bitwise_xor(a, b, out=scratch)
+    np.right_shift(scratch, 1, out=scratch)
+    np.bitwise_and(scratch, 0x7F7F7F7F, out=scratch)
+    np.bitwise_and(a, b, out=out)
+    np.add(out, scratch, out=out)
+
+class Upscale2x:
+    """Bilinear 2x upscale between surfaces of the same pixel format.
+
+    Roughly half the cost of smoothscale for this fixed ratio, since each new
+    pixel is a single packed average of its neighbours.
+    """
+
+    def __init__(self):
+        self.scratch = {}  # Scratch arrays per source size
+
+    def apply(self, source, dest):
+        w, h = source.get_size()
+        if (w, h) not in self.scratch:
+            self.scratch[(w, h)] = (np.empty((h, w - 1), np.uint32), np.empty((h, w - 1), np.uint32),
+                                    np.empty((h - 1, w * 2), np.uint32), np.empty((h - 1, w * 2), np.uint32))
+        row, row_scratch, col, col_scratch = self.scratch[(w, h)]
+
+        # Transposed views walk the surfaces in memory order
+        small = pygame.surfarray.pixels2d(source).T
+        large = pygame.surfarray.pixels2d(dest).T
+
+        # Even rows: source pixels with horizontal averages between them
+        even = large[0::2]
+        even[:, 0::2] = small
+        average_packed(small[:, :-1], small[:, 1:], row, row_scratch)
+        even[:, 1:-1:2] = row
+        even[:, -1] = small[:, -1]
+
+        # Odd rows: vertical averages of the even rows around them
+        average_packed(large[0:-2:2], large[2::2], col, col_scratch)
+        large[1:-1:2] = col
+        large[-1] = large[-2]
+        del small, large
+
+class SoftBlur:
+    """Blends in a blurred copy of the frame.
+
+    All filtering happens on a copy point-sampled down by the given factor,
+    which is filtered down once more. It is smoothly scaled up to half size and the last doubling
+    uses Upscale2x, so no resampling filter runs at full resolution.
+    """
+
+    def __init__(self, mix):
+        self.alpha = int(255 * mix)
+        self.layers = {}  # (sampled, small, half, blurred) per frame size and factor
+        self.upscale = Upscale2x()
+
+    def apply(self, surface, factor):
+        size = surface.get_size()
+        w, h = size[0] // factor, size[1] // factor
+        if (size, factor) not in self.layers:
+            blurred = pygame.Surface(size, 0, surface)
+            blurred.set_alpha(self.alpha)
+            self.layers[(size, factor)] = (pygame.Surface((w, h), 0, surface),
+                                           pygame.Surface((w // 2, h // 2), 0, surface),
+                                           pygame.Surface((size[0] // 2, size[1] // 2), 0, surface),
+                                           blurred)
+        sampled, small, half, blurred = self.layers[(size, factor)]
+
+        pygame.transform.scale(surface, (w, h), sampled)
+        pygame.transform.smoothscale(sampled, small.get_size(), small)
+        pygame.transform.smoothscale(small, half.get_size(), half)
+        self.upscale.apply(half, blurred)
+        surface.blit(blurred, (0, 0))
+
+class ChromaShift:
+    """Splits the red and blue channels apart horizontally."""
+
+    def __init__(self, offset):
+        self.offset = offset  # In full-resolution pixels
+
+    def apply(self, surface):
+        # Rounded rather than floored, so small offsets stay distinct when scaled down
+        offset = max(1, int(self.offset * surface.get_width() / SCREEN_WIDTH + 0.5))
+        pixels = pygame.surfarray.pixels3d(surface)
+        pixels[offset:, :, 0] = pixels[:-offset, :, 0]
+        pixels[:-offset, :, 2] = pixels[offset:, :, 2]
+        del pixels
+
+class Vignette:
+    """Darkens the frame edges with a precomputed multiply mask."""
+
+    def __init__(self, strength):
+        self.strength = strength
+        self.masks = {}  # Mask per frame size
+
+    def apply(self, surface):
+        size = surface.get_size()
+        if size not in self.masks:
+            x = np.linspace(-1, 1, size[0])[:, None]
+            y = np.linspace(-1, 1, size[1])[None, :]
+            distance = np.clip((np.sqrt(x**2 + y**2) / math.sqrt(2) - 0.35) / 0.65, 0, 1)
+            shade = (255 * (1 - self.strength * distance**2)).astype(np.uint8)
+            self.masks[size] = pygame.surfarray.make_surface(np.dstack((shade, shade, shade)))
+
+        surface.blit(self.masks[size], (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+
+class PostProcessor:
+    """Chain of full-screen effects applied to the composed frame.
+
+    The frame is point-sampled down by POSTFX_SCALE, processed there and
+    scaled back up bilinearly, so the scene stays smooth rather than
+    pixel-doubled. Running the chain at full resolution would cost about
+    POSTFX_SCALE**2 times as much, well past a few milliseconds, so it is
+    never used. If even this path runs over POSTFX_BUDGET_MS, the soft blur
+    layer - the most expensive effect - is dropped for good.
+    """
+
+    def __init__(self, mood):
+        settings = MOODS[mood]
+        self.mood = mood
+        self.grade = ColorGrade(mood)
+        self.chroma = ChromaShift(settings["chroma"]) if settings["chroma"] else None
+        self.blur = SoftBlur(settings["blur"]) if settings["blur"] else None
+        self.vignette = Vignette(settings["vignette"]) if settings["vignette"] else None
+
+        self.work = None
+        self.upscale = Upscale2x()
+        self.frames = 0
+        self.cost_ms = 0.0
+
+    def prepare(self, screen):
+        """Allocate every buffer up front so the first frames don't hitch."""
+        frame = screen.copy()
+        self.apply(screen)
+        screen.blit(frame, (0, 0))
+        self.frames = 0
+        self.cost_ms = 0.0
+
+    def apply_effects(self, surface):
+        self.grade.apply(surface)
+        if self.chroma:
+            self.chroma.apply(surface)
+        if self.blur:
+            self.blur.apply(surface, max(2, POSTFX_BLUR_FACTOR // POSTFX_SCALE))
+        if self.vignette:
+            self.vignette.apply(surface)
+
+    def apply(self, screen):
+        start = time.perf_counter()
+
+        size = (screen.get_width() // POSTFX_SCALE, screen.get_height() // POSTFX_SCALE)
+        if self.work is None or self.work.get_size() != size:
+            self.work = pygame.Surface(size, 0, screen)
+        pygame.transform.scale(screen, size, self.work)
+        self.apply_effects(self.work)
+        if POSTFX_SCALE == 2:
+            self.upscale.apply(self.work, screen)
+        else:
+            pygame.transform.smoothscale(self.work, screen.get_size(), screen)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.cost_ms += (elapsed_ms - self.cost_ms) * 0.1
+        self.frames += 1
+        if self.blur and self.frames >= POSTFX_SAMPLE_FRAMES and self.cost_ms > POSTFX_BUDGET_MS:
+            self.blur = None
+
+def synthesize_sound(name, frequency):
+    """Generate a mono effect in [-1, 1] for when no sample file is provided."""
+    def envelope(duration, attack, decay):
+        t = np.arange(int(duration * frequency)) / frequency
+        return t, np.minimum(t / attack, 1) * np.exp(-t / decay)
+
+    def smooth(wave, width):
+        return np.convolve(wave, np.ones(width) / width, mode='same')
+
+    rng = np.random.default_rng(0)
+    if name == "splash":
+        t, env = envelope(0.45, 0.005, 0.12)
+        wave = smooth(rng.uniform(-1, 1, len(t)), 6) * env
+    elif name == "trick":
+        t, env = envelope(0.3, 0.01, 0.1)
+        pitch = 660 + 330 * t / t[-1]
+        phase = 2 * math.pi * np.cumsum(pitch) / frequency
+        wave = (np.sin(phase) + 0.3 * np.sin(2 * phase)) * env
+    elif name == "crowd":
+        t, env = envelope(1.4, 0.35, 0.5)
+        noise = smooth(rng.uniform(-1, 1, len(t)), 12) - smooth(rng.uniform(-1, 1, len(t)), 60)
+        wave = noise * env * (1 + 0.3 * np.sin(2 * math.pi * 7 * t))
+    else:  # bubble
+        t, env = envelope(0.07, 0.004, 0.02)
+        wave = np.sin(2 * math.pi * (500 * t + 6000 * t**2)) * env
+
+    return wave / max(1e-6, np.abs(wave).max())
+
+@dataclass
+class Voice:
+    channel: pygame.mixer.Channel
+    priority: int = 0
+    started: int = 0
+
+class AudioEngine:
+    """Sound effects on a fixed voice pool, plus crossfaded music stems.
+
+    Effects are decoded (or synthesized) into memory at startup. Each play
+    is rate limited per sound and takes a free voice, or steals the oldest
+    voice of equal or lower priority; otherwise it is dropped.
+
+    The main music bed is streamed through pygame.mixer.music, so it is
+    never fully decoded into memory. The overlay stems are short loops held
+    as Sounds, each on its own reserved channel. Everything starts looping
+    at startup and switching stems only crossfades volumes, so nothing is
+    restarted or loaded mid-game. Without a mixer everything is a no-op.
+    """
+
     def __init__(self):
+        self.enabled = pygame.mixer.get_init() is not None
+        self.sounds = {}
+        self.voices: List[Voice] = []
+        self.last_played = {}
+        self.stems = {}  # name -> [channel or pygame.mixer.music, volume]
+        self.music_stem = None
+        if not self.enabled:
+            return
+
+        # Overlay channels come first and are reserved, effects use the rest
+        pygame.mixer.set_num_channels(len(MUSIC_OVERLAYS) + AUDIO_VOICES)
+        pygame.mixer.set_reserved(len(MUSIC_OVERLAYS))
+        self.voices = [Voice(pygame.mixer.Channel(len(MUSIC_OVERLAYS) + i)) for i in range(AUDIO_VOICES)]
+        for name in SOUNDS:
+            self.sounds[name] = self.load_sound(name)
+
+        path = self.find_stem(MUSIC_BED)
+        if path:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(0.0)
+            pygame.mixer.music.play(loops=-1)
+            # The music module fades like a channel
+            self.stems[MUSIC_BED] = [pygame.mixer.music, 0.0]
+        for i, stem in enumerate(MUSIC_OVERLAYS):
+            path = self.find_stem(stem)
+            if path:
+                channel = pygame.mixer.Channel(i)
+                channel.set_volume(0.0)
+                channel.play(pygame.mixer.Sound(path), loops=-1)
+                self.stems[stem] = [channel, 0.0]
+
+    def find_stem(self, name):
+        for extension in (".ogg", ".wav"):
+            path = os.path.join(MUSIC_DIR, name + extension)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def load_sound(self, name):
+        path = os.path.join(SOUND_DIR, name + ".wav")
+        if os.path.exists(path):
+            return pygame.mixer.Sound(path)
+
+        # Mixer is pre-initialized to signed 16-bit samples
+        frequency, _, channels = pygame.mixer.get_init()
+        samples = (synthesize_sound(name, frequency) * 0.8 * 32767).astype(np.int16)
+        if channels > 1:
+            samples = np.repeat(samples[:, None], channels, axis=1)
+        return pygame.sndarray.make_sound(np.ascontiguousarray(samples))
+
+    def play(self, name, volume=1.0):
+        if not self.enabled:
+            return False
+
+        priority, min_interval = SOUNDS[name]
+        now = pygame.time.get_ticks()
+        last = self.last_played.get(name)
+        if last is not None and now - last < min_interval:
+            return False
+
+        voice = self.find_voice(priority)
+        if voice is None:
+            return False
+
+        # Playing on a busy channel stops whatever it had
+        voice.channel.set_volume(volume)
+        voice.channel.play(self.sounds[name])
+        voice.priority = priority
+        voice.started = now
+        self.last_played[name] = now
+        return True
+
+    def find_voice(self, priority):
+        victim = None
+        for voice in self.voices:
+            if not voice.channel.get_busy():
+                return voice
+            if voice.priority <= priority and (victim is None or
+                                               (voice.priority, voice.started) < (victim.priority, victim.started)):
+                victim = voice
+        return victim
+
+    def set_music(self, stem):
+        self.music_stem = stem
+
+    def update(self):
+        # Step every stem's volume toward its target, crossfading in one pass
+        step = MUSIC_VOLUME / MUSIC_FADE_FRAMES
+        for stem, state in self.stems.items():
+            channel, volume = state
+            target = MUSIC_VOLUME if stem == self.music_stem else 0.0
+            if volume != target:
+                volume = min(target, volume + step) if volume < target else max(target, volume - step)
+                channel.set_volume(volume)
+                state[1] = volume
+
+class Telemetry:
+    """Per-session event log.
+
+    Records are fixed-size (frame, event, a, b) rows stored in preallocated
+    column arrays, so logging is a handful of index writes with no allocation.
+    A background thread drains pending rows in batches to gzipped JSONL.
+    If the writer falls a full buffer behind, new records are dropped and counted.
+    """
+
+    def __init__(self, path=None, capacity=TELEMETRY_CAPACITY, batch=TELEMETRY_BATCH):
+        if path is None:
+            os.makedirs(TELEMETRY_DIR, exist_ok=True)
+            path = os.path.join(TELEMETRY_DIR, time.strftime("session-%Y%m%d-%H%M%S.jsonl.gz"))
+        self.path = path
+        self.capacity = capacity
+        self.batch = batch
+
+        # Ring buffer columns
+        self.frames = array('l', [0]) * capacity
+        self.events = array('b', [0]) * capacity
+        self.a = array('d', [0.0]) * capacity
+        self.b = array('d', [0.0]) * capacity
+
+        # head is only advanced by the game loop, tail only by the writer
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0
+        self.frame = 0
+
+        self._closed = False
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+
+    def log(self, event, a=0.0, b=0.0):
+        head = self.head
+        if head - self.tail >= self.capacity:
+            self.dropped += 1
+            return
+        i = head % self.capacity
+        self.frames[i] = self.frame
+        self.events[i] = event
+        self.a[i] = a
+        self.b[i] = b
+        self.head = head + 1
+        if head + 1 - self.tail == self.batch:
+            self._wake.set()
+
+    def end_frame(self, frame_ms, particles):
+        self.log(EVT_FRAME, frame_ms, particles)
+        self.frame += 1
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+
+    def _run(self):
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            while not self._closed:
+                self._wake.wait(TELEMETRY_FLUSH_INTERVAL)
+                self._wake.clear()
+                self._drain(f)
+            self._drain(f)
+            if self.dropped:
+                f.write(json.dumps({"event": "dropped", "count": self.dropped}) + "\n")
+
+    def _drain(self, f):
+        head = self.head
+        lines = []
+        for n in range(self.tail, head):
+            i = n % self.capacity
+            name, field_a, field_b = TELEMETRY_EVENTS[self.events[i]]
+            lines.append(json.dumps({"frame": self.frames[i], "event": name,
+                                     field_a: self.a[i], field_b: self.b[i]}))
+        if lines:
+            f.write("\n".join(lines) + "\n")
+            # Sync flush so a crashed session still leaves readable records
+            f.flush()
+        self.tail = head
+
+def summarize_telemetry(paths):
+    """Aggregate any number of session files into a single summary dict."""
+    counts = Counter()
+    tricks = Counter()
+    frame_hist = Counter()  # Frame times in 0.1 ms buckets
+    frame_total = 0.0
+    max_particles = 0
+    trick_points = 0
+    clean_bonus = 0
+    gc_ms_total = 0.0
+    gc_ms_max = 0.0
+
+    for path in paths:
+        counts["sessions"] += 1
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    record = json.loads(line)
+                    event = record["event"]
+                    counts[event] += record.get("count", 1) if event == "dropped" else 1
+                    if event == "frame":
+                        frame_ms = record["frame_ms"]
+                        frame_total += frame_ms
+                        frame_hist[int(frame_ms * 10)] += 1
+                        max_particles = max(max_particles, int(record["particles"]))
+                    elif event == "trick":
+                        tricks[int(record["rotations"])] += 1
+                        trick_points += int(record["points"])
+                    elif event == "clean_entry":
+                        clean_bonus += int(record["bonus"])
+                    elif event == "gc":
+                        gc_ms_total += record["gc_ms"]
+                        gc_ms_max = max(gc_ms_max, record["gc_ms"])
+        except (EOFError, OSError, zlib.error, json.JSONDecodeError,
+                KeyError, TypeError, UnicodeDecodeError):
+            # Truncated or damaged session - keep the records read so far
+            counts["corrupt_sessions"] += 1
+
+    def percentile(q):
+        target = q * counts["frame"]
+        seen = 0
+        for bucket in sorted(frame_hist):
+            seen += frame_hist[bucket]
+            if seen >= target:
+                return bucket / 10
+        return 0.0
+
+    frames = counts["frame"]
+    return {
+        "sessions": counts["sessions"],
+        "corrupt_sessions": counts["corrupt_sessions"],
+        "frames": frames,
+        "frame_ms_mean": frame_total / frames if frames else 0.0,
+        "frame_ms_p95": percentile(0.95),
+        "frame_ms_p99": percentile(0.99),
+        "frame_ms_max": max(frame_hist) / 10 if frame_hist else 0.0,
+        "max_particles": max_particles,
+        "jumps": counts["jump"],
+        "tricks": counts["trick"],
+        "tricks_by_rotations": {str(k): tricks[k] for k in sorted(tricks)},
+        "trick_points": trick_points,
+        "splashes": counts["splash"],
+        "clean_entries": counts["clean_entry"],
+        "clean_entry_bonus": clean_bonus,
+        "combo_breaks": counts["combo_break"],
+        "gc_collections": counts["gc"],
+        "gc_ms_mean": gc_ms_total / counts["gc"] if counts["gc"] else 0.0,
+        "gc_ms_max": gc_ms_max,
+        "dropped_records": counts["dropped"],
+    }
+
+class Game:
+    def __init__(self, telemetry=False, trace_allocations=0, mood=None):
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Echoes of Blue")
         self.clock = pygame.time.Clock()
@@ -370,6 +1093,14 @@ class Game:
 
         self.wave_offset = 0
 
+        self.telemetry = Telemetry() if telemetry else None
+        self.scheduler = FrameScheduler(self.telemetry, trace_allocations)
+        self.post_fx = PostProcessor(mood) if mood else None
+        if self.post_fx:
+            self.post_fx.prepare(self.screen)
+        self.audio = AudioEngine()
+        self.swell_timer = 0
+
     def create_splash(self, x, y, intensity=1.0):
         num_particles = int(40 * intensity)
         for _ in range(num_particles):
@@ -417,6 +1148,14 @@ class Game:
         self.combo_timer = 150
         self.show_trick_popup(trick_name, total_points)
 
+        if self.telemetry:
+            self.telemetry.log(EVT_TRICK, int(trick_name.split('x')[-1]), total_points)
+
+    def break_combo(self):
+        if self.combo > 0 and self.telemetry:
+            self.telemetry.log(EVT_COMBO_BREAK, self.combo, self.score)
+        self.combo = 0
+
     def draw_background(self):
         # Sky gradient with smooth transition
         for y in range(int(WATER_LEVEL)):
@@ -646,103 +1385,158 @@ class Game:
         self.screen.blit(start, start_rect)
 
     def run(self):
-        while self.running:
-            keys = pygame.key.get_pressed()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-
-                if event.type == pygame.KEYDOWN:
-                    if not self.game_started:
-                        if event.key == pygame.K_SPACE:
-                            self.game_started = True
-                    else:
-                        if event.key == pygame.K_SPACE:
-                            if self.dolphin.jump():
-                                self.create_splash(self.dolphin.x, WATER_LEVEL, 1.2)
-                                # Reset combo when jumping (fresh start)
+        self.scheduler.start()
+        try:
+            while self.running:
+                self.scheduler.begin_frame()
+                keys = pygame.key.get_pressed()
+
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self.running = False
+
+                    if event.type == pygame.KEYDOWN:
+                        if not self.game_started:
+                            if event.key == pygame.K_SPACE:
+                                self.game_started = True
+                        else:
+                            if event.key == pygame.K_SPACE:
+                                if self.dolphin.jump():
+                                    self.create_splash(self.dolphin.x, WATER_LEVEL, 1.2)
+                                    self.audio.play("splash", 0.6)
+                                    if self.telemetry:
+                                        speed = math.sqrt(self.dolphin.vx**2 + self.dolphin.vy**2)
+                                        self.telemetry.log(EVT_JUMP, speed, self.dolphin.vy)
+                                    # Reset combo when jumping (fresh start)
+                                    if len(self.dolphin.tricks_completed) == 0:
+                                        self.break_combo()
+
+                # Update
+                if self.game_started:
+                    result = self.dolphin.update(keys)
+
+                    # Handle events from dolphin
+                    if result:
+                        if isinstance(result, tuple):
+                            event_type = result[0]
+
+                            if event_type == 'splash':
+                                clean_entry = result[1]
+                                intensity = 1.5 if clean_entry else 1.0
+                                self.create_splash(self.dolphin.x, WATER_LEVEL, intensity)
+                                self.audio.play("splash", 1.0 if clean_entry else 0.75)
+                                if self.telemetry:
+                                    self.telemetry.log(EVT_SPLASH, clean_entry, len(self.dolphin.tricks_completed))
+
+                                # Landing bonus for clean entry
+                                if clean_entry and len(self.dolphin.tricks_completed) > 0:
+                                    bonus = 100 * max(1, self.combo)
+                                    self.score += bonus
+                                    self.show_trick_popup("Clean Entry!", bonus)
+                                    self.audio.play("crowd", min(1.0, 0.4 + 0.15 * self.combo))
+                                    if self.telemetry:
+                                        self.telemetry.log(EVT_CLEAN_ENTRY, bonus, self.combo)
+
+                                # Reset combo if no tricks were performed
                                 if len(self.dolphin.tricks_completed) == 0:
-                                    self.combo = 0
-
-            # Update
-            if self.game_started:
-                result = self.dolphin.update(keys)
-
-                # Handle events from dolphin
-                if result:
-                    if isinstance(result, tuple):
-                        event_type = result[0]
-
-                        if event_type == 'splash':
-                            clean_entry = result[1]
-                            intensity = 1.5 if clean_entry else 1.0
-                            self.create_splash(self.dolphin.x, WATER_LEVEL, intensity)
-
-                            # Landing bonus for clean entry
-                            if clean_entry and len(self.dolphin.tricks_completed) > 0:
-                                bonus = 100 * max(1, self.combo)
-                                self.score += bonus
-                                self.show_trick_popup("Clean Entry!", bonus)
-
-                            # Reset combo if no tricks were performed
-                            if len(self.dolphin.tricks_completed) == 0:
-                                self.combo = 0
-
-                        elif event_type == 'trick_complete':
-                            trick_name = result[1]
-                            self.handle_trick_complete(trick_name)
-
-                # Update particles
-                self.particles = [p for p in self.particles if p.life > 0]
-                for particle in self.particles:
-                    particle.update()
-
-                # Swimming trail with bubbles
-                if self.dolphin.in_water:
-                    speed = math.sqrt(self.dolphin.vx**2 + self.dolphin.vy**2)
-                    if speed > 2:
-                        for i in range(int(speed * 0.4)):
-                            life = random.randint(20, 40)
-                            particle = Particle(
-                                x=self.dolphin.x - self.dolphin.vx * random.uniform(0.5, 1.5),
-                                y=self.dolphin.y + random.uniform(-15, 15),
-                                vx=random.uniform(-0.5, 0.5),
-                                vy=random.uniform(-1.5, -0.5),  # Bubbles float up
-                                size=random.uniform(1, 5),
-                                alpha=255,
-                                color=PARTICLE_WHITE if random.random() > 0.5 else PARTICLE_BLUE,
-                                life=life,
-                                max_life=life,
-                                glow=random.random() > 0.7
-                            )
-                            self.particles.append(particle)
-
-                # Combo timer
-                if self.combo_timer > 0:
-                    self.combo_timer -= 1
-                    if self.combo_timer == 0:
-                        self.combo = 0
-
-            # Draw
-            if not self.game_started:
-                self.draw_title_screen()
-            else:
-                self.draw_background()
-                self.draw_water()
+                                    self.break_combo()
+
+                            elif event_type == 'trick_complete':
+                                trick_name = result[1]
+                                self.handle_trick_complete(trick_name)
+                                self.audio.play("trick")
+
+                    # Update particles
+                    self.particles = [p for p in self.particles if p.life > 0]
+                    for particle in self.particles:
+                        particle.update()
+
+                    # Swimming trail with bubbles
+                    if self.dolphin.in_water:
+                        speed = math.sqrt(self.dolphin.vx**2 + self.dolphin.vy**2)
+                        if speed > 2:
+                            self.audio.play("bubble", 0.25)
+                            for i in range(int(speed * 0.4)):
+                                life = random.randint(20, 40)
+                                particle = Particle(
+                                    x=self.dolphin.x - self.dolphin.vx * random.uniform(0.5, 1.5),
+                                    y=self.dolphin.y + random.uniform(-15, 15),
+                                    vx=random.uniform(-0.5, 0.5),
+                                    vy=random.uniform(-1.5, -0.5),  # Bubbles float up
+                                    size=random.uniform(1, 5),
+                                    alpha=255,
+                                    color=PARTICLE_WHITE if random.random() > 0.5 else PARTICLE_BLUE,
+                                    life=life,
+                                    max_life=life,
+                                    glow=random.random() > 0.7
+                                )
+                                self.particles.append(particle)
+
+                    # Combo timer
+                    if self.combo_timer > 0:
+                        self.combo_timer -= 1
+                        if self.combo_timer == 0:
+                            self.break_combo()
+
+                # Music follows the performance - the swell holds for a while
+                # after the combo drops so it doesn't flap on every jump
+                if self.combo >= MUSIC_SWELL_COMBO:
+                    self.swell_timer = MUSIC_SWELL_HOLD
+                elif self.swell_timer > 0:
+                    self.swell_timer -= 1
+
+                if not self.game_started:
+                    self.audio.set_music("title")
+                elif self.swell_timer > 0:
+                    self.audio.set_music("swell")
+                else:
+                    self.audio.set_music("tank")
+                self.audio.update()
+
+                # Draw
+                if not self.game_started:
+                    self.draw_title_screen()
+                else:
+                    self.draw_background()
+                    self.draw_water()
+
+                    # Draw particles
+                    for particle in self.particles:
+                        particle.draw(self.screen)
 
-                # Draw particles
-                for particle in self.particles:
-                    particle.draw(self.screen)
+                    self.dolphin.draw(self.screen)
+                    if self.post_fx:
+                        self.post_fx.apply(self.screen)
+                    self.draw_hud()
 
-                self.dolphin.draw(self.screen)
-                self.draw_hud()
+                self.scheduler.frame_peak()
+                pygame.display.flip()
+                frame_ms = self.clock.tick(FPS)
 
-            pygame.display.flip()
-            self.clock.tick(FPS)
+                if self.telemetry and self.game_started:
+                    self.telemetry.end_frame(frame_ms, len(self.particles))
 
-        pygame.quit()
+                self.scheduler.idle(self.clock.get_rawtime())
+        finally:
+            self.scheduler.stop()
+            if self.telemetry:
+                self.telemetry.close()
+            pygame.quit()
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description="Echoes of Blue")
+    parser.add_argument("--telemetry", action="store_true",
+                        help="record frame timing and gameplay events to telemetry/")
+    parser.add_argument("--summarize", nargs="+", metavar="PATH",
+                        help="summarize recorded telemetry sessions and exit")
+    parser.add_argument("--trace-allocations", type=int, default=0, metavar="FRAMES",
+                        help="print a tracemalloc report every FRAMES frames")
+    parser.add_argument("--mood", choices=sorted(MOODS),
+                        help="apply a mood's post-processing to the whole game")
+    args = parser.parse_args()
+
+    if args.summarize:
+        print(json.dumps(summarize_telemetry(args.summarize), indent=2))
+    else:
+        game = Game(telemetry=args.telemetry, trace_allocations=args.trace_allocations, mood=args.mood)
+        game.run()
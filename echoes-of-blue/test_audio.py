@@ -0,0 +1,106 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import wave
+
+import numpy as np
+import pygame
+import pytest
+
+import game
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000]
+    monkeypatch.setattr(game.pygame.time, "get_ticks", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def audio():
+    engine = game.AudioEngine()
+    if not engine.enabled:
+        pytest.skip("no mixer available")
+    yield engine
+    pygame.mixer.stop()
+    pygame.mixer.music.stop()
+
+
+def test_rate_limit(audio, clock):
+    _, min_interval = game.SOUNDS["bubble"]
+    assert audio.play("bubble")
+    clock[0] += min_interval - 1
+    assert not audio.play("bubble")
+    clock[0] += 1
+    assert audio.play("bubble")
+
+
+def test_voice_stealing(audio, clock):
+    _, min_interval = game.SOUNDS["crowd"]
+    for _ in range(game.AUDIO_VOICES):
+        clock[0] += min_interval
+        assert audio.play("crowd")
+    oldest = min(audio.voices, key=lambda voice: voice.started)
+
+    # Lower priority sounds are dropped when the pool is full
+    assert not audio.play("bubble")
+
+    # Higher priority sounds take over the oldest voice
+    clock[0] += min_interval
+    assert audio.play("trick")
+    assert oldest.priority == game.SOUNDS["trick"][0]
+    assert oldest.started == clock[0]
+
+
+def test_music_crossfade(audio):
+    sound = audio.sounds["crowd"]
+    for i, stem in enumerate(("tank", "swell")):
+        channel = pygame.mixer.Channel(i)
+        channel.play(sound, loops=-1)
+        audio.stems[stem] = [channel, game.MUSIC_VOLUME if stem == "tank" else 0.0]
+
+    audio.set_music("swell")
+    audio.update()
+    assert 0 < audio.stems["swell"][1] < game.MUSIC_VOLUME
+    assert 0 < audio.stems["tank"][1] < game.MUSIC_VOLUME
+
+    for _ in range(game.MUSIC_FADE_FRAMES):
+        audio.update()
+    assert audio.stems["swell"][1] == game.MUSIC_VOLUME
+    assert audio.stems["tank"][1] == 0.0
+
+
+def test_music_bed_is_streamed(tmp_path, monkeypatch):
+    for stem in (game.MUSIC_BED,) + game.MUSIC_OVERLAYS:
+        with wave.open(str(tmp_path / f"{stem}.wav"), "wb") as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(22050)
+            f.writeframes(np.zeros(22050, np.int16).tobytes())
+    monkeypatch.setattr(game, "MUSIC_DIR", str(tmp_path))
+
+    engine = game.AudioEngine()
+    if not engine.enabled:
+        pytest.skip("no mixer available")
+    try:
+        assert engine.stems[game.MUSIC_BED][0] is pygame.mixer.music
+        assert pygame.mixer.music.get_busy()
+        for stem in game.MUSIC_OVERLAYS:
+            assert isinstance(engine.stems[stem][0], pygame.mixer.Channel)
+
+        engine.set_music(game.MUSIC_BED)
+        for _ in range(game.MUSIC_FADE_FRAMES):
+            engine.update()
+        assert pygame.mixer.music.get_volume() == pytest.approx(game.MUSIC_VOLUME, abs=0.01)
+
+        engine.set_music("swell")
+        for _ in range(game.MUSIC_FADE_FRAMES):
+            engine.update()
+        assert pygame.mixer.music.get_volume() == 0.0
+        assert engine.stems["swell"][1] == pytest.approx(game.MUSIC_VOLUME)
+    finally:
+        pygame.mixer.stop()
+        pygame.mixer.music.stop()
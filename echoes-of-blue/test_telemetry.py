@@ -0,0 +1,53 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pytest
+
+import game
+
+
+@pytest.fixture
+def session(tmp_path):
+    path = str(tmp_path / "session.jsonl.gz")
+    telemetry = game.Telemetry(path)
+    for i in range(2000):
+        telemetry.log(game.EVT_TRICK, 1 + i % 4, 200)
+        telemetry.end_frame(16.0 + i % 7, i % 50)
+    telemetry.close()
+    return path
+
+
+def test_summary(session):
+    summary = game.summarize_telemetry([session])
+    assert summary["sessions"] == 1
+    assert summary["corrupt_sessions"] == 0
+    assert summary["frames"] == 2000
+    assert summary["tricks"] == 2000
+
+
+def test_damaged_sessions_are_counted(session, tmp_path):
+    with open(session, "rb") as f:
+        data = f.read()
+
+    truncated = tmp_path / "truncated.jsonl.gz"
+    truncated.write_bytes(data[:len(data) // 2])
+
+    flipped = bytearray(data)
+    for i in range(len(data) // 2, len(data) // 2 + 60):
+        flipped[i] ^= 0xFF
+    bit_flipped = tmp_path / "flipped.jsonl.gz"
+    bit_flipped.write_bytes(bytes(flipped))
+
+    not_gzip = tmp_path / "not_gzip.jsonl.gz"
+    not_gzip.write_bytes(b"not a gzip file")
+
+    missing = tmp_path / "missing.jsonl.gz"
+
+    paths = [session, str(truncated), str(bit_flipped), str(not_gzip), str(missing)]
+    summary = game.summarize_telemetry(paths)
+    assert summary["sessions"] == 5
+    assert summary["corrupt_sessions"] == 4
+    # Records read before the damage are kept
+    assert summary["frames"] > 2000